@@ -9,6 +9,7 @@ load_dotenv()
 MAX_UPLOAD_BYTES = 50 * 1024 * 1024  # 50 MB
 MAX_ROWS = 100_000  # hard limit on rows to read or generate
 FAST_SAMPLE_ROWS = 5_000  # rows to sample in fast mode
+PARALLEL_PROFILE_MIN_ROWS = 10_000  # below this, per-column threading costs more than it saves
 DEFAULT_PARSE_MODE = "fast"
 
 # Environment-driven config
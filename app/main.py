@@ -2,7 +2,7 @@ from typing import Optional
 
 from fastapi import Depends, FastAPI, File, HTTPException, UploadFile
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse, StreamingResponse
+from fastapi.responses import JSONResponse, ORJSONResponse, StreamingResponse
 from fastapi.templating import Jinja2Templates
 from fastapi import Request, Form
 
@@ -10,7 +10,7 @@ from app import config
 from app.config import ParseMode
 from app.models import ProfileResult
 from app.services.profile import profile_upload
-from app.services.synth import profile_to_csv
+from app.services.synth import iter_csv_chunks
 
 app = FastAPI(title="Scrambler API", version="0.1.0")
 templates = Jinja2Templates(directory="templates")
@@ -43,7 +43,7 @@ def index(request: Request):
     return templates.TemplateResponse("report.html", {"request": request})
 
 
-@app.post("/api/profile")
+@app.post("/api/profile", response_class=ORJSONResponse)
 async def api_profile(
     file: UploadFile = File(...),
     mode: Optional[str] = None,
@@ -63,12 +63,15 @@ async def api_generate(
 ):
     if rows <= 0:
         raise HTTPException(status_code=400, detail="rows must be positive")
+    # validate before streaming starts: once the generator yields, the 200
+    # status line is already on the wire and generate_rows' check is too late
+    if rows > config.MAX_ROWS:
+        raise HTTPException(status_code=400, detail="Requested rows exceed 100k limit")
     parse_mode = get_parse_mode(mode)
     profile = profile_upload(file, mode=parse_mode)
     dec_sep = decimal_separator if decimal_separator in {".", ","} else profile.decimal_separator
-    csv_bytes = profile_to_csv(profile, rows=rows, seed=seed, decimal_separator=dec_sep)
     return StreamingResponse(
-        iter([csv_bytes]),
+        iter_csv_chunks(profile, rows=rows, seed=seed, decimal_separator=dec_sep),
         media_type="text/csv",
         headers={
             "Content-Disposition": "attachment; filename=synthetic.csv",
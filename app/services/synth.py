@@ -1,11 +1,11 @@
+import base64
 import csv
 import io
 import random
-import string
 from datetime import datetime, timedelta, date
-from decimal import Decimal
-from typing import Iterable, List
+from typing import Callable, Iterable, List
 
+import numpy as np
 from fastapi import HTTPException
 
 from app import config
@@ -28,118 +28,175 @@ def _parsed_allowed_numbers(allowed: List[str] | None, cast):
     return parsed
 
 
-def _scrambled_token(min_len: int, max_len: int) -> str:
-    # Generate high-entropy token within bounds; if bounds are too small, clamp to at least 1
+def _scrambled_token(rnd: random.Random, min_len: int, max_len: int) -> str:
+    # Generate high-entropy token within bounds; if bounds are too small, clamp to at least 1.
+    # One randbytes call plus base64 replaces a per-character choices() loop;
+    # the urlsafe alphabet (letters, digits, '-', '_') is also CSV-quote-safe.
     min_len = max(1, min_len)
     max_len = max(min_len, max_len)
-    length = random.randint(min_len, max_len)
-    alphabet = string.ascii_letters + string.digits + "_-+=@#%&$!*"  # richer noise
-    return "".join(random.choices(alphabet, k=length))
+    length = rnd.randint(min_len, max_len)
+    raw = rnd.randbytes((length * 3 + 3) // 4)
+    return base64.urlsafe_b64encode(raw).decode("ascii")[:length]
 
 
-def _mutate_string(base: str, min_len: int, max_len: int) -> str:
-    # Always produce a new, high-entropy token—base is only used to influence length bounds
-    return _scrambled_token(min_len, max_len)
-
-
-def _generate_value(constraint: FieldConstraint, decimal_sep: str = ".") -> str:
-    if random.random() < _null_probability(constraint) and constraint.nullable:
-        return ""
-
+def _compile_value_generator(constraint: FieldConstraint, rnd: random.Random) -> Callable[[], str]:
+    # Build a zero-arg closure with length bounds and allowed values resolved
+    # once. Only string-like constraints reach this path — numeric, boolean
+    # and date columns are filled by the batch kernels in _generate_column.
+    if constraint.allowed_values:
+        allowed = constraint.allowed_values
+        fixed_min, fixed_max = constraint.min_length, constraint.max_length
+
+        def gen() -> str:
+            candidate = rnd.choice(allowed)
+            min_len = fixed_min or max(1, len(candidate))
+            max_len = fixed_max or max(min_len, len(candidate) + 8)
+            return _scrambled_token(rnd, min_len, max_len)
+    else:
+        min_len = constraint.min_length or 8
+        max_len = constraint.max_length or max(min_len + 8, 24)
+        if max_len < min_len:
+            max_len = min_len
+
+        def gen() -> str:
+            return _scrambled_token(rnd, min_len, max_len)
+
+    if constraint.nullable:
+        null_p = _null_probability(constraint)
+        if null_p > 0.0:
+            value_gen = gen
+
+            def gen() -> str:
+                if rnd.random() < null_p:
+                    return ""
+                return value_gen()
+
+    return gen
+
+
+def _date_bounds(constraint: FieldConstraint) -> tuple[datetime, int]:
+    default_start = datetime.now() - timedelta(days=365)
+    default_end = datetime.now()
+    start = datetime.fromisoformat(constraint.date_min) if constraint.date_min else default_start
+    end = datetime.fromisoformat(constraint.date_max) if constraint.date_max else default_end
+    if start >= end:
+        end = start + timedelta(days=1)
+    return start, int((end - start).total_seconds())
+
+
+def _apply_nulls(rng: np.random.Generator, constraint: FieldConstraint, values: List[str]) -> List[str]:
+    if not constraint.nullable:
+        return values
+    null_p = _null_probability(constraint)
+    if null_p <= 0.0:
+        return values
+    mask = rng.random(len(values)) < null_p
+    return ["" if hit else v for hit, v in zip(mask, values)]
+
+
+def _generate_column(constraint: FieldConstraint, rows: int, rng: np.random.Generator, rnd: random.Random, decimal_sep: str) -> List[str]:
+    # Batch kernels fill a whole column with one Generator call; only string
+    # columns (and unknown types) fall through to the compiled scalar closure.
     if constraint.type == FieldType.BOOLEAN:
-        return random.choice(["true", "false"])
+        bits = rng.integers(0, 2, size=rows)
+        return _apply_nulls(rng, constraint, np.where(bits == 1, "true", "false").tolist())
 
     if constraint.type == FieldType.INTEGER:
-        allowed_ints = _parsed_allowed_numbers(constraint.allowed_values, int)
         low = int(constraint.min_value) if constraint.min_value is not None else 0
         high = int(constraint.max_value) if constraint.max_value is not None else max(low + 1, 1000)
         if low == high:
             high = low + 10
+        allowed_ints = _parsed_allowed_numbers(constraint.allowed_values, int)
         if allowed_ints:
-            choice = random.choice(allowed_ints)
-            jitter = random.randint(-5, 5)
-            candidate = max(low, min(high, choice + jitter))
-            return str(candidate)
-        return str(random.randint(low, high))
+            # sample from the observed values, jitter and clip — all vectorized
+            vals = rng.choice(np.asarray(allowed_ints, dtype=np.int64), size=rows)
+            vals += rng.integers(-5, 6, size=rows)
+            np.clip(vals, low, high, out=vals)
+        else:
+            vals = rng.integers(low, high + 1, size=rows)
+        return _apply_nulls(rng, constraint, vals.astype(str).tolist())
 
-    if constraint.type == FieldType.FLOAT:
-        allowed_floats = _parsed_allowed_numbers(constraint.allowed_values, float)
-        low = constraint.min_value if constraint.min_value is not None else 0.0
-        high = constraint.max_value if constraint.max_value is not None else max(low + 1.0, 1000.0)
+    if constraint.type in {FieldType.FLOAT, FieldType.DECIMAL}:
+        low = float(constraint.min_value) if constraint.min_value is not None else 0.0
+        if constraint.max_value is not None:
+            high = float(constraint.max_value)
+        else:
+            high = 1000.0 if constraint.type == FieldType.DECIMAL else max(low + 1.0, 1000.0)
         if low == high:
             high = low + 1.0
+        allowed_floats = _parsed_allowed_numbers(constraint.allowed_values, float)
         if allowed_floats:
-            choice = random.choice(allowed_floats)
-            span = max(0.1, (high - low) * 0.05)
-            candidate = max(low, min(high, choice + random.uniform(-span, span)))
-            out = f"{candidate:.3f}"
-            return out.replace(".", decimal_sep) if decimal_sep == "," else out
-        out = f"{random.uniform(low, high):.3f}"
-        return out.replace(".", decimal_sep) if decimal_sep == "," else out
-
-    if constraint.type == FieldType.DECIMAL:
-        allowed_decimals = _parsed_allowed_numbers(constraint.allowed_values, Decimal)
-        low = Decimal(str(constraint.min_value)) if constraint.min_value is not None else Decimal("0")
-        high = Decimal(str(constraint.max_value)) if constraint.max_value is not None else Decimal("1000")
-        if low == high:
-            high = low + Decimal("1")
-        if allowed_decimals:
-            choice = random.choice(allowed_decimals)
-            span = (high - low) * Decimal("0.05")
-            candidate = choice + Decimal(random.uniform(-float(span), float(span)))
-            candidate = min(high, max(low, candidate))
+            span = (high - low) * 0.05
+            if constraint.type == FieldType.FLOAT:
+                span = max(0.1, span)
+            vals = rng.choice(np.asarray(allowed_floats), size=rows)
+            vals += rng.uniform(-span, span, size=rows)
+            np.clip(vals, low, high, out=vals)
         else:
-            candidate = low + (high - low) * Decimal(str(random.random()))
-        out = format(candidate.quantize(Decimal("0.001")), "f")
-        return out.replace(".", decimal_sep) if decimal_sep == "," else out
+            vals = rng.uniform(low, high, size=rows)
+        out = np.char.mod("%.3f", vals)
+        if decimal_sep == ",":
+            out = np.char.replace(out, ".", ",")
+        return _apply_nulls(rng, constraint, out.tolist())
 
     if constraint.type in {FieldType.DATE, FieldType.DATETIME}:
-        default_start = datetime.now() - timedelta(days=365)
-        default_end = datetime.now()
-        start = datetime.fromisoformat(constraint.date_min) if constraint.date_min else default_start
-        end = datetime.fromisoformat(constraint.date_max) if constraint.date_max else default_end
-        if start >= end:
-            end = start + timedelta(days=1)
-        delta_seconds = int((end - start).total_seconds())
-        offset = random.randint(0, max(1, delta_seconds))
-        sample_dt = start + timedelta(seconds=offset)
+        start, delta_seconds = _date_bounds(constraint)
+        offsets = rng.integers(0, max(1, delta_seconds) + 1, size=rows)
         if constraint.type == FieldType.DATE:
-            return sample_dt.date().isoformat()
-        return sample_dt.isoformat(sep="T", timespec="seconds")
+            values = [(start + timedelta(seconds=int(o))).date().isoformat() for o in offsets]
+        else:
+            values = [(start + timedelta(seconds=int(o))).isoformat(sep="T", timespec="seconds") for o in offsets]
+        return _apply_nulls(rng, constraint, values)
 
-    # Strings (and everything else defaults to scrambled strings)
-    if constraint.allowed_values:
-        candidate = random.choice(constraint.allowed_values)
-        min_len = constraint.min_length or max(1, len(candidate))
-        max_len = constraint.max_length or max(min_len, len(candidate) + 8)
-        return _mutate_string(candidate, min_len, max_len)
+    gen = _compile_value_generator(constraint, rnd)
+    return [gen() for _ in range(rows)]
 
-    min_len = constraint.min_length or 8
-    max_len = constraint.max_length or max(min_len + 8, 24)
-    if max_len < min_len:
-        max_len = min_len
-    return _scrambled_token(min_len, max_len)
 
+def _generate_columns(profile: ProfileResult, rows: int, seed: int | None, decimal_separator: str | None) -> List[List[str]]:
+    # dedicated RNG instances: no module-global state, no per-call name lookup
+    rng = np.random.default_rng(seed)
+    rnd = random.Random(seed)
+    decimal_sep = decimal_separator or getattr(profile, "decimal_separator", ".") or "."
+    return [_generate_column(c, rows, rng, rnd, decimal_sep) for c in profile.fields]
 
-def generate_rows(profile: ProfileResult, rows: int, seed: int | None = None) -> Iterable[List[str]]:
+
+def generate_rows(profile: ProfileResult, rows: int, seed: int | None = None, decimal_separator: str | None = None) -> Iterable[List[str]]:
     if rows > config.MAX_ROWS:
         raise HTTPException(status_code=400, detail="Requested rows exceed 100k limit")
-    if seed is not None:
-        random.seed(seed)
-    constraints = profile.fields
-    decimal_sep = getattr(profile, "decimal_separator", ".") or "."
-    for _ in range(rows):
-        yield [_generate_value(c, decimal_sep=decimal_sep) for c in constraints]
+    columns = _generate_columns(profile, rows, seed, decimal_separator)
+    if not columns:
+        for _ in range(rows):
+            yield []
+        return
+    for row in zip(*columns):
+        yield list(row)
+
+
+def iter_csv_chunks(profile: ProfileResult, rows: int, seed: int | None = None, decimal_separator: str | None = None) -> Iterable[bytes]:
+    # Rows are encoded as they are produced; the decimal separator is applied
+    # at generation time, so no whole-buffer rewrite pass is needed.
+    encoding = profile.encoding or "utf-8"
+    delim = profile.delimiter
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, delimiter=delim)
+    writer.writerow([c.name for c in profile.fields])
+    yield buffer.getvalue().encode(encoding)
+    # Generated cells only contain base64 token characters, digits, '-', ':',
+    # 'T' and the decimal separator, so csv quoting can be skipped unless the
+    # decimal separator collides with the delimiter. Header names above are
+    # arbitrary and keep the real writer.
+    dec_sep = decimal_separator or getattr(profile, "decimal_separator", ".") or "."
+    if delim in {",", ";", "\t", "|"} and dec_sep != delim:
+        join = delim.join
+        for row in generate_rows(profile, rows, seed, decimal_separator=decimal_separator):
+            yield (join(row) + "\r\n").encode(encoding)
+        return
+    for row in generate_rows(profile, rows, seed, decimal_separator=decimal_separator):
+        buffer.seek(0)
+        buffer.truncate()
+        writer.writerow(row)
+        yield buffer.getvalue().encode(encoding)
 
 
 def profile_to_csv(profile: ProfileResult, rows: int, seed: int | None = None, decimal_separator: str | None = None) -> bytes:
-    output = io.StringIO()
-    writer = csv.writer(output, delimiter=profile.delimiter)
-    dec_sep = decimal_separator or getattr(profile, "decimal_separator", ".") or "."
-    writer.writerow([c.name for c in profile.fields])
-    for row in generate_rows(profile, rows, seed):
-        writer.writerow(row)
-    data = output.getvalue()
-    if dec_sep != ".":
-        data = data.replace(".", dec_sep)
-    return data.encode(profile.encoding or "utf-8")
+    return b"".join(iter_csv_chunks(profile, rows, seed=seed, decimal_separator=decimal_separator))
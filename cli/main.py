@@ -1,26 +1,31 @@
 import pathlib
 from typing import Optional
 
+import orjson
 import typer
 
 from app import config
 from app.config import ParseMode
 from app.services.profile import (
-    enforce_limits,
-    profile_from_text,
-    decode_content,
+    decode_stream,
     detect_delimiter,
+    detect_encoding,
+    enforce_limits,
+    profile_from_stream,
 )
 from app.services.synth import profile_to_csv
 
 app = typer.Typer(help="Scrambler CLI")
 
 
-def _read_file(path: pathlib.Path) -> str:
+def _profile_file(path: pathlib.Path, mode: ParseMode):
     data = path.read_bytes()
     limited = enforce_limits(data)
-    text, _ = decode_content(limited)
-    return text
+    encoding, _ = detect_encoding(limited[:65536])
+    stream = decode_stream(limited, encoding)
+    delimiter = detect_delimiter(stream.read(8192))
+    stream.seek(0)
+    return profile_from_stream(stream, delimiter=delimiter, parse_mode=mode, encoding=encoding)
 
 
 @app.command()
@@ -28,10 +33,8 @@ def profile(
     file: pathlib.Path = typer.Argument(..., exists=True, readable=True, help="CSV file to profile"),
     mode: ParseMode = typer.Option(ParseMode.FAST, help="fast or strict"),
 ):
-    text = _read_file(file)
-    delimiter = detect_delimiter(text)
-    result = profile_from_text(text, delimiter=delimiter, parse_mode=mode, encoding="utf-8")
-    typer.echo(result.json(indent=2))
+    result = _profile_file(file, mode)
+    typer.echo(orjson.dumps(result.dict(), option=orjson.OPT_INDENT_2).decode())
 
 
 @app.command()
@@ -45,9 +48,7 @@ def generate(
 ):
     if rows <= 0 or rows > config.MAX_ROWS:
         raise typer.BadParameter("rows must be between 1 and 100000")
-    text = _read_file(file)
-    delimiter = detect_delimiter(text)
-    profile_result = profile_from_text(text, delimiter=delimiter, parse_mode=mode, encoding="utf-8")
+    profile_result = _profile_file(file, mode)
     dec_sep = decimal_separator if decimal_separator in {".", ","} else profile_result.decimal_separator
     csv_bytes = profile_to_csv(profile_result, rows=rows, seed=seed, decimal_separator=dec_sep)
     output.write_bytes(csv_bytes)
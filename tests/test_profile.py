@@ -10,7 +10,15 @@ from app.models import FieldType
 from app.services import profile as profile_service
 
 
-def test_profile_infers_types_and_lengths():
+@pytest.fixture(params=["pandas", "csv"])
+def profile_engine(request, monkeypatch):
+    # run profiling tests against both the pandas engine and the csv fallback
+    if request.param == "csv":
+        monkeypatch.setattr(profile_service, "pd", None)
+    return request.param
+
+
+def test_profile_infers_types_and_lengths(profile_engine):
     csv_text = """a,b,c
 1,hello,TRUE
 2,world,false
@@ -41,17 +49,50 @@ def test_profile_enforces_row_limit():
     assert "Row limit" in exc.value.detail
 
 
+def _upload(data: bytes, content_type: str = "text/csv") -> UploadFile:
+    spooled = tempfile.SpooledTemporaryFile()
+    spooled.write(data)
+    spooled.seek(0)
+    return UploadFile(filename="data.csv", file=spooled, headers={"content-type": content_type})
+
+
 def test_validate_csv_upload_rejects_non_csv():
-    fake_file = tempfile.SpooledTemporaryFile()
-    fake_file.write(b"{}")
-    fake_file.seek(0)
-    upload = UploadFile(filename="data.json", file=fake_file, headers={"content-type": "application/json"})
+    upload = _upload(b"{}", content_type="application/json")
     with pytest.raises(HTTPException) as exc:
         profile_service.validate_csv_upload(upload)
     assert exc.value.status_code == 415
     assert "CSV" in exc.value.detail
 
 
+def test_profile_upload_streams_and_detects_encoding():
+    upload = _upload("café\tval\nélan\t7\n".encode("latin-1"))
+    result = profile_service.profile_upload(upload, mode=ParseMode.STRICT)
+    assert result.row_count == 1
+    assert result.delimiter == "\t"
+    assert result.encoding.lower() in {"latin-1", "iso-8859-1", "cp1252"}
+
+
+def test_profile_upload_rejects_oversized_file(monkeypatch):
+    monkeypatch.setattr(config, "MAX_UPLOAD_BYTES", 64)
+    upload = _upload(b"a,b\n" + b"1,x\n" * 100)
+    with pytest.raises(HTTPException) as exc:
+        profile_service.profile_upload(upload)
+    assert exc.value.status_code == 413
+    assert "too large" in exc.value.detail.lower()
+
+
+def test_profiles_rows_with_extra_fields(profile_engine):
+    csv_text = """a,b
+1,x
+2,y,stray
+3,z
+"""
+    result = profile_service.profile_from_text(csv_text, parse_mode=ParseMode.STRICT)
+    assert result.row_count == 3
+    assert [f.name for f in result.fields] == ["a", "b"]
+    assert result.fields[0].type == FieldType.INTEGER
+
+
 def test_detects_semicolon_delimiter():
     csv_text = """a;b;c
 1;2;3
@@ -73,6 +114,17 @@ def test_detects_latin1_encoding_and_tab_delimiter():
     assert result.row_count == 1
 
 
+def test_date_shaped_but_invalid_values_stay_strings():
+    csv_text = """d
+2024-13-99
+0000-00-00
+"""
+    result = profile_service.profile_from_text(csv_text, parse_mode=ParseMode.STRICT)
+    d_field = result.fields[0]
+    assert d_field.type == FieldType.STRING
+    assert d_field.date_min is None and d_field.date_max is None
+
+
 def test_detects_date_datetime_and_decimal():
     csv_text = """d,dt,price
 2024-01-02,2024-01-02T10:00:00,12.345
@@ -6,7 +6,7 @@ from fastapi import HTTPException
 
 from app import config
 from app.models import FieldConstraint, FieldType, ProfileResult
-from app.services.synth import generate_rows, profile_to_csv
+from app.services.synth import generate_rows, iter_csv_chunks, profile_to_csv
 
 
 def basic_profile() -> ProfileResult:
@@ -65,6 +65,39 @@ def test_profile_to_csv_outputs_header_and_rows():
     assert len(rows) == 3  # header + 2 data rows
 
 
+def test_iter_csv_chunks_streams_one_chunk_per_row():
+    profile = basic_profile()
+    chunks = list(iter_csv_chunks(profile, rows=3, seed=42))
+    assert len(chunks) == 4  # header + 3 data rows
+    assert b"".join(chunks) == profile_to_csv(profile, rows=3, seed=42)
+    # distinct delimiter and decimal separator: fast join path, no quoting
+    assert b'"' not in b"".join(chunks[1:])
+
+
+def test_iter_csv_chunks_quotes_when_separator_collides_with_delimiter():
+    profile = ProfileResult(
+        row_count=1,
+        fields=[
+            FieldConstraint(
+                name="x",
+                type=FieldType.FLOAT,
+                nullable=False,
+                min_value=1.0,
+                max_value=2.0,
+            )
+        ],
+        delimiter=",",
+        decimal_separator=",",
+    )
+    data = b"".join(iter_csv_chunks(profile, rows=3, seed=7)).decode("utf-8")
+    rows = list(csv.reader(io.StringIO(data)))
+    assert rows[0] == ["x"]
+    # ',' decimals inside a ','-delimited file must stay quoted as one field
+    for row in rows[1:]:
+        assert len(row) == 1
+        assert 1.0 <= float(row[0].replace(",", ".")) <= 2.0
+
+
 def test_integer_generation_with_allowed_values_stays_numeric_and_bounded():
     profile = ProfileResult(
         row_count=1,